@@ -352,51 +352,276 @@ class MinimaxPruneAgent(MinimaxAgent):
 
         Returns: the minimax utility value of the state
         """
-        if state.is_full():
-            return state.utility()
-        else:
-            util = []
-            for i in state.successors():
-                util.append(self.minimax(i[1]))
-            max = -math.inf
-            min = math.inf
-            for i in util:
-                if i > max:
-                    max = i
-                if i < min:
-                    min = i
-            if state.next_player() == 1:
-                return max
+        lo, hi = self.score_bounds(state)
+        return self.alphabeta(state, -math.inf, math.inf, lo, hi)
+
+    def get_move(self, state):
+        """Select the best available move, searching each move against the best one so far."""
+        nextp = state.next_player()
+        best_util = -math.inf if nextp == 1 else math.inf
+        best_move = None
+        best_state = None
+        bounds = self.score_bounds(state)
+        for move, next_state in state.successors():
+            lo, hi = self.child_score_bounds(state, bounds, move, next_state)
+            if nextp == 1:
+                util = self.alphabeta(next_state, best_util, math.inf, lo, hi)
             else:
-                return min
+                util = self.alphabeta(next_state, -math.inf, best_util, lo, hi)
+            if ((nextp == 1) and (util > best_util)) or ((nextp == -1) and (util < best_util)):
+                best_util, best_move, best_state = util, move, next_state
+        return best_move, best_state
 
-    def alphabeta(self, state,alpha, beta):
-        """This is just a helper method for minimax(). Feel free to use it or not."""
-        if state.is_full():
-            return state.utility()
+    def alphabeta(self, state, alpha, beta, lo, hi):
+        """Helper for minimax() that searches the state within the (alpha, beta) window.
+
+        Besides the usual alpha-beta cutoffs, a state is not expanded at all when its bounds on
+        the final utility (see score_bounds()) already fall outside the window.
+
+        Args:
+            state: a connect383.GameState object representing the current board
+            alpha: the value Player 1 is already assured of elsewhere
+            beta: the value Player 2 is already assured of elsewhere
+            lo: pessimistic bound on the utility of the state
+            hi: optimistic bound on the utility of the state
+
+        Returns: the minimax utility value of the state if it lies within (alpha, beta);
+            otherwise an upper bound (<= alpha) or lower bound (>= beta) on it
+        """
+        if lo == hi or hi <= alpha:
+            return hi
+        if lo >= beta:
+            return lo
+        maximizing = state.next_player() == 1
+        best_util = -math.inf if maximizing else math.inf
+        bounds = (lo, hi)
+        for move, next_state in state.successors():
+            lo, hi = self.child_score_bounds(state, bounds, move, next_state)
+            util = self.alphabeta(next_state, alpha, beta, lo, hi)
+            if maximizing:
+                best_util = max(best_util, util)
+                alpha = max(alpha, util)
+            else:
+                best_util = min(best_util, util)
+                beta = min(beta, util)
+            if alpha >= beta:
+                break
+        return best_util
+
+    def score_bounds(self, state):
+        """Bound the utility that can still be reached from the given state.
+
+        Turning a piece from -1 to 1 can only join Player 1's streaks and split Player 2's, so
+        the utility never decreases.  Filling every empty square with Player 2's pieces therefore
+        gives a pessimistic bound on the final utility, and filling them with Player 1's pieces an
+        optimistic one.  Both are exact once the board is full.
+
+        Args:
+            state: a connect383.GameState object representing the current board
+
+        Returns: a (lo, hi) tuple of bounds on the final utility, from Player 1's perspective
+        """
+        lo, hi = 0, 0
+        for line in state.get_rows() + state.get_cols() + state.get_diags():
+            lo += self.line_bound(line, -1)
+            hi += self.line_bound(line, 1)
+        return lo, hi
+
+    def child_score_bounds(self, state, bounds, move, next_state):
+        """Incrementally update score_bounds() for the successor reached by a move.
+
+        Only the row, column and two diagonals through the new piece can change, and only in the
+        bound that filled its square with the other player's piece.
+
+        Args:
+            state: a connect383.GameState object representing the current board
+            bounds: the (lo, hi) tuple of bounds for state
+            move: the column played to reach next_state
+            next_state: the successor of state reached by move
+
+        Returns: a (lo, hi) tuple of bounds for next_state
+        """
+        row = 0
+        while state.board[row][move] != 0:
+            row += 1
+        # the new piece was already assumed by the bound that fills empty squares with its
+        # player's pieces, so only the other bound needs updating
+        player = state.next_player()
+        lo, hi = bounds
+        change = 0
+        for line, next_line in zip(self.lines_through(state.board, row, move),
+                                   self.lines_through(next_state.board, row, move)):
+            change += self.line_bound(next_line, -player) - self.line_bound(line, -player)
+        if player == 1:
+            return lo + change, hi
         else:
-            util = []
-            max = alpha
-            min = beta
-            for i in state.successors():
-                val = self.minimax(i, alpha, beta)
-                if state.next_player() == 1:
-                    if val > max:
-                        break
+            return lo, hi + change
+
+    def lines_through(self, board, row, col):
+        """Return the row, column and both diagonals of the board passing through a square."""
+        rows = range(len(board))
+        cols = range(len(board[0]))
+        return [
+            board[row],
+            [board[r][col] for r in rows],
+            [board[r][r - row + col] for r in rows if (r - row + col) in cols],
+            [board[r][row + col - r] for r in rows if (row + col - r) in cols],
+        ]
+
+    def line_bound(self, line, fill):
+        """Score a line as GameState.scores() would, with its empty squares set to fill.
+
+        Returns: Player 1's streak points minus Player 2's
+        """
+        score = 0
+        prev = None
+        length = 0
+        for elt in line:
+            if elt == 0:
+                elt = fill
+            if elt == prev:
+                length += 1
+                continue
+            if prev in (1, -1) and length >= 3:
+                score += prev * length**2
+            prev = elt
+            length = 1
+        if prev in (1, -1) and length >= 3:
+            score += prev * length**2
+        return score
+
+
+class PVSLookaheadAgent(MinimaxLookaheadAgent):
+    """Depth-limited agent that uses principal-variation search (NegaScout) with aspiration windows.
+
+    The search deepens iteratively up to depth_limit.  Each iteration is searched with a window
+    of +/- aspiration_window around the previous iteration's value, and is re-searched with an
+    open bound on a fail-high or fail-low.  Inside the tree, the first child is searched with the
+    full window and its siblings with a null window, re-searching only those that fail high.
+
+    Successors are still explored in the order returned by GameState.successors(), so the value
+    and the chosen move are the same as MinimaxLookaheadAgent's at equal depth.
+    """
+
+    aspiration_window = 16  # half-width of the window around the previous iteration's value
+
+    def get_move(self, state):
+        """Select the best available move by iterative deepening with aspiration windows."""
+        depth_limit = self.depth_limit
+        guess = None
+        try:
+            for depth in range(depth_limit + 1):
+                self.depth_limit = depth + 1  # the root itself counts as one ply
+                guess, best_move, best_state = self.aspiration(state, guess)
+        finally:
+            self.depth_limit = depth_limit
+        return best_move, best_state
+
+    def aspiration(self, state, guess):
+        """Search the root with a window around guess, widening it until the value falls inside.
+
+        Args:
+            state: a connect383.GameState object representing the current board
+            guess: the value from the previous iteration, or None to search with a full window
+
+        Returns: a (value, move, state) tuple for the best move
+        """
+        if guess is None:
+            alpha, beta = -math.inf, math.inf
+        else:
+            alpha, beta = guess - self.aspiration_window, guess + self.aspiration_window
+        while True:
+            value, move, next_state = self.pvs(state, alpha, beta)
+            if value <= alpha:
+                alpha = -math.inf
+            elif value >= beta:
+                beta = math.inf
+            else:
+                return value, move, next_state
+
+    def minimax(self, state):
+        """Determine the heuristically estimated minimax utility value of the given state."""
+        return self.pvs(state, -math.inf, math.inf)[0]
+
+    def pvs(self, state, alpha, beta):
+        """Fail-soft principal-variation search of state within the (alpha, beta) window.
+
+        Evaluations are integers, so (alpha, alpha + 1) is used as the null window.
+
+        Args:
+            state: a connect383.GameState object representing the current board
+            alpha: lower bound of the search window
+            beta: upper bound of the search window
+
+        Returns: a (value, move, state) tuple; value is exact if alpha < value < beta, otherwise
+            it is an upper (value <= alpha) or lower (value >= beta) bound on the exact value
+        """
+        if state.is_full() or self.depth_limit == 0:
+            return self.evaluation(state), None, None
+        maximizing = state.next_player() == 1
+        best_util = -math.inf if maximizing else math.inf
+        best_move = None
+        best_state = None
+        self.depth_limit -= 1
+        try:
+            for move, next_state in state.successors():
+                if best_move is None:
+                    util = self.pvs(next_state, alpha, beta)[0]
+                elif maximizing:
+                    util = self.pvs(next_state, alpha, alpha + 1)[0]
+                    if alpha < util < beta:
+                        util = self.pvs(next_state, alpha, beta)[0]
                 else:
-                    if val < min:
-                        break
-                
-                util.append(val)
-            for i in util:
-                if i > max:
-                    max = i
-                if i < min:
-                    min = i
-            if state.next_player() == 1:
-                return max
+                    util = self.pvs(next_state, beta - 1, beta)[0]
+                    if alpha < util < beta:
+                        util = self.pvs(next_state, alpha, beta)[0]
+                if ((maximizing and util > best_util) or (not maximizing and util < best_util)
+                        or best_move is None):
+                    best_util, best_move, best_state = util, move, next_state
+                if maximizing:
+                    alpha = max(alpha, util)
+                else:
+                    beta = min(beta, util)
+                if alpha >= beta:
+                    break
+        finally:
+            self.depth_limit += 1
+        return best_util, best_move, best_state
+
+
+class MTDfLookaheadAgent(PVSLookaheadAgent):
+    """Depth-limited agent that uses MTD(f): a sequence of null-window searches converging on the
+    minimax value, seeded with the previous iteration's value.
+
+    Returns the same value and move as MinimaxLookaheadAgent at equal depth.
+    """
+
+    def aspiration(self, state, guess):
+        """Converge on the root value with null-window searches starting from guess.
+
+        Args:
+            state: a connect383.GameState object representing the current board
+            guess: the value from the previous iteration, or None to start from 0
+
+        Returns: a (value, move, state) tuple for the best move
+        """
+        maximizing = state.next_player() == 1
+        value = 0 if guess is None else guess
+        lower, upper = -math.inf, math.inf
+        best_move = None
+        best_state = None
+        while lower < upper:
+            beta = value + 1 if value == lower else value
+            value, move, next_state = self.pvs(state, beta - 1, beta)
+            if value < beta:
+                upper = value
+                if not maximizing:
+                    best_move, best_state = move, next_state
             else:
-                return min
+                lower = value
+                if maximizing:
+                    best_move, best_state = move, next_state
+        return value, best_move, best_state
 
 
 def get_agent(tag):
@@ -411,6 +636,12 @@ def get_agent(tag):
     elif tag.startswith('look'):
         depth = int(tag[4:])
         return MinimaxLookaheadAgent(depth)
+    elif tag.startswith('pvs'):
+        depth = int(tag[3:])
+        return PVSLookaheadAgent(depth)
+    elif tag.startswith('mtd'):
+        depth = int(tag[3:])
+        return MTDfLookaheadAgent(depth)
     elif tag.startswith('alt'):
         depth = int(tag[3:])
         return AltMinimaxLookaheadAgent(depth)
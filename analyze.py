@@ -0,0 +1,113 @@
+"""Batch post-game analysis for Connect383 game records.
+
+Replays the games stored by connect383.play_game(..., record_file=...) and re-scores every
+position with a (usually deeper) search, in a pool of worker processes.  Moves that lose more
+than a given margin against the best available move are flagged as blunders, and the states
+each player generated on positions where there was a choice, but it did not matter, are
+reported as wasted.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import agents
+from connect383 import GameState, read_records
+
+
+def analyze_position(job):
+    """Score every move available in a position.
+
+    Args:
+        job: a (board, agent tag, exact tag, exact threshold) tuple; positions with at most
+            exact threshold moves left are scored with the exact tag's agent instead
+
+    Returns: a {move: value} dictionary, values from Player 1's perspective
+    """
+    board, tag, exact_tag, exact_below = job
+    state = GameState(board)
+    if exact_tag is not None and state.moves_left() <= exact_below:
+        tag = exact_tag
+    agent = agents.get_agent(tag)
+    return {move: agent.minimax(next_state) for move, next_state in state.successors()}
+
+
+def replay(record):
+    """Return the list of (state, move, states generated, seconds) tuples of a game record."""
+    state = GameState(record['start'])
+    positions = []
+    for move, states_created, seconds in record['moves']:
+        positions.append((state, move, states_created, seconds))
+        state = dict(state.successors())[move]
+    return positions
+
+
+def analyze(records, tag, exact_tag=None, exact_below=0, margin=9, workers=None):
+    """Re-score every position of the given games and print blunders and wasted search.
+
+    Args:
+        records: game records, as returned by connect383.read_records()
+        tag: agent tag used to score the moves (see agents.get_agent())
+        exact_tag: agent tag used instead once at most exact_below moves are left
+        exact_below: number of moves left at which to switch to exact_tag
+        margin: how much worse than the best move a move must be to count as a blunder (by
+            default 9, the points for a 3-streak)
+        workers: number of worker processes (defaults to the number of CPUs)
+
+    Returns: a list of (game, turn, player, move, value, best move, best value) blunder tuples
+    """
+    games = [replay(record) for record in records]
+    jobs = [(state.board, tag, exact_tag, exact_below)
+            for positions in games for state, _, _, _ in positions]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        scores = iter(list(pool.map(analyze_position, jobs)))
+
+    blunders = []
+    wasted = {}  # (game, player) -> [states generated, seconds, moves] spent on moves that didn't matter
+    for game, positions in enumerate(games):
+        for turn, (state, move, states_created, seconds) in enumerate(positions):
+            move__value = next(scores)
+            player = 1 if state.next_player() == 1 else 2
+            sign = state.next_player()
+            best_move = max(move__value, key=lambda m: sign * move__value[m])
+            best_value = move__value[best_move]
+            value = move__value[move]
+            if sign * (best_value - value) >= margin:
+                blunders.append((game, turn, player, move, value, best_move, best_value))
+            if len(move__value) > 1 and len(set(move__value.values())) == 1:
+                waste = wasted.setdefault((game, player), [0, 0.0, 0])
+                waste[0] += states_created
+                waste[1] += seconds
+                waste[2] += 1
+
+    for game, record in enumerate(records):
+        print("Game {}: {} vs {} on {}, final score {} - {}".format(
+            game, *(record['players'] or ['?', '?']), record['board'], *record['score']))
+        for _, turn, player, move, value, best_move, best_value in \
+                [b for b in blunders if b[0] == game]:
+            print("  Turn {}: Player {} blundered, column {} ({}) instead of column {} ({})".format(
+                turn, player, move, value, best_move, best_value))
+        for player in (1, 2):
+            if (game, player) in wasted:
+                states_created, seconds, count = wasted[(game, player)]
+                print("  Player {} spent {} states ({:.3f}s) on {} moves where every choice "
+                      "was equal".format(player, states_created, seconds, count))
+    return blunders
+
+
+#############################################
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('records', nargs='+', help="Files of game records written by connect383.py")
+    parser.add_argument('--agent', default='pvs4', help="Agent tag used to re-score moves")
+    parser.add_argument('--exact', default='prune', help="Agent tag used for exact endgame scores")
+    parser.add_argument('--exact-below', type=int, default=10,
+                        help="Use the exact agent once at most this many moves are left")
+    parser.add_argument('--margin', type=int, default=9,
+                        help="Minimum loss against the best move to count as a blunder")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes")
+    args = parser.parse_args()
+
+    records = [record for path in args.records for record in read_records(path)]
+    analyze(records, args.agent, args.exact, args.exact_below, args.margin, args.workers)
@@ -58,6 +58,31 @@ boards['test_predict'] = [
     [ -1,   0, -1,  1, -1 ] 
 ]  # put something here!
 
+boards['endgame_5x5_1'] = [
+    [  0,  0,  0,  0,  1 ],
+    [  0, -1,  0,  0, -1 ],
+    [  0,  1,  1,  0, -1 ],
+    [ -1,  1,  1,  0, -1 ],
+    [  1, -1,  1, -1,  1 ]
+]
+
+boards['endgame_5x5_2'] = [
+    [  0,  0,  0,  0,  1 ],
+    [  0,  0,  0, -1,  1 ],
+    [  1,  0,  0, -1, -1 ],
+    [  1,  0,  1, -1, -1 ],
+    [  1,  1,  1, -1, -1 ]
+]
+
+boards['endgame_6x7'] = [
+    [  0, -1,  1, -1,  0,  0,  0 ],
+    [  0, -1,  1,  1,  1,  0, -1 ],
+    [  0,  1,  1, -1, -1,  0,  1 ],
+    [ -1,  1, -1,  1,  1,  0,  1 ],
+    [ -1,  1,  1,  1, -1,  1, -1 ],
+    [  1, -1, -1, -1, -1, -1,  1 ]
+]
+
 boards['your_testest'] = []  # put something here!
 
 
@@ -1,4 +1,6 @@
 import argparse
+import json
+import time
 
 import agents
 import boards
@@ -44,6 +46,10 @@ class GameState:
         """Checks to see if there are available moves left."""
         return self._moves_left <= 0
 
+    def moves_left(self):
+        """Returns the number of moves left before the board is full."""
+        return self._moves_left
+
     def _create_successor(self, col):
         """Create the successor state that follows from a given move."""
 
@@ -146,13 +152,18 @@ def streaks(lst):
     return rets
 
 
-def play_game(player1, player2, state):
+def play_game(player1, player2, state, record_file=None, tags=None, brd=None):
     """Run a Connect383 game.
 
     Player objects can be of any class that defines a get_move(state, depth) method that returns
     a move, state tuple.
+
+    If record_file is given, a game record (see write_record()) is appended to it, labelled with
+    the players' agent tags and the board tag when those are supplied.
     """
     print(state)
+    start_state = state
+    moves = []
 
     turn = 0
     p1_state_count, p2_state_count = 0, 0
@@ -161,7 +172,9 @@ def play_game(player1, player2, state):
         player = player1 if state.next_player() == 1 else player2
 
         state_count_before = GameState.state_count
+        time_before = time.perf_counter()
         move, state_next = player.get_move(state)
+        seconds = time.perf_counter() - time_before
         state_count_after = GameState.state_count
 
         states_created = state_count_after - state_count_before
@@ -169,6 +182,7 @@ def play_game(player1, player2, state):
             p1_state_count += states_created
         else:
             p2_state_count += states_created        
+        moves.append([move, states_created, round(seconds, 4)])
 
         print("Turn {}:".format(turn))        
         print("Player {} moves to column {}".format(1 if state.next_player() == 1 else 2, move))
@@ -188,22 +202,82 @@ def play_game(player1, player2, state):
     print("Player 1 generated {} states".format(p1_state_count))
     print("Player 2 generated {} states".format(p2_state_count))
     print("")
+    if record_file is not None:
+        write_record(record_file, {
+            'board': brd,
+            'start': start_state.board,
+            'players': tags,
+            'moves': moves,
+            'score': [score1, score2],
+        })
     return score1, score2
 
 
+def write_record(path, record):
+    """Append a game record to a file, one JSON object per line.
+
+    A record holds the board tag and its starting contents (bottom row first, as stored in
+    GameState.board), the players' agent tags, the final score, and the list of moves.  Each
+    move is a [column, states generated, seconds] triple, so the game can be replayed and the
+    search effort behind every move inspected later (see analyze.py).
+    """
+    with open(path, 'a') as f:
+        f.write(json.dumps(record, separators=(',', ':')) + "\n")
+
+
+def read_records(path):
+    """Return the list of game records stored in a file by write_record()."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_agents(tags, brds):
+    """Compare the states and time each agent needs to pick its first move on each board.
+
+    Args:
+        tags: agent tags, as accepted by agents.get_agent()
+        brds: board tags, as accepted by boards.get_board()
+    """
+    for brd in brds:
+        state = GameState(boards.get_board(brd))
+        if state.is_full():
+            continue
+        print("Board {}:".format(brd))
+        for tag in tags:
+            player = agents.get_agent(tag)
+            state_count_before = GameState.state_count
+            time_before = time.perf_counter()
+            move, _ = player.get_move(state)
+            seconds = time.perf_counter() - time_before
+            states_created = GameState.state_count - state_count_before
+            print("  {:>8}: moves to column {}, generated {} states in {:.2f}s".format(
+                tag, move, states_created, seconds))
+        print("")
+
+
 #############################################
 
 if __name__ == "__main__":
 
     parser = argparse.ArgumentParser()
-    parser.add_argument('play1', help="Player 1 type { random, human, mini, lookN, prune, altN }")
-    parser.add_argument('play2', help="Player 2 type { random, human, mini, lookN, prune, altN }")
+    parser.add_argument('play1', help="Player 1 type { random, human, mini, lookN, pvsN, mtdN, prune, altN }")
+    parser.add_argument('play2', help="Player 2 type { random, human, mini, lookN, pvsN, mtdN, prune, altN }")
     parser.add_argument('brd', help="Board (valid tag or specified RxC)")
+    parser.add_argument('--record', metavar='FILE', help="Append a record of the game to FILE")
+    parser.add_argument('--compare', nargs='*', metavar='TAG',
+                        help="Instead of playing, compare the states generated by both players (and "
+                             "any further agent TAGs) for their first move on brd, which may be a "
+                             "comma-separated list of boards")
     args = parser.parse_args()
     # print("args:", args)  
 
+    if args.compare is not None:
+        compare_agents([args.play1, args.play2] + args.compare, args.brd.split(','))
+        raise SystemExit
+
     player1 = agents.get_agent(args.play1)
     player2 = agents.get_agent(args.play2)
     start_state = GameState(boards.get_board(args.brd))
-    play_game(player1, player2, start_state)
+    play_game(player1, player2, start_state, record_file=args.record,
+              tags=[args.play1, args.play2], brd=args.brd)
 